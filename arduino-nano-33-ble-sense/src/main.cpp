@@ -12,7 +12,7 @@
 
 /* BLE */
 BLEService customService("12345678-1234-5678-1234-56789abcdefa");
-BLEStringCharacteristic inferenceChar("12345678-1234-5678-1234-56789abcdef7", BLERead | BLENotify, 20);
+BLEStringCharacteristic inferenceChar("12345678-1234-5678-1234-56789abcdef7", BLERead | BLEWrite | BLENotify, 20);
 
 /* TFLite */
 const int kTensorArenaSize = 93 * 1024;
@@ -24,6 +24,13 @@ int8_t imageBuffer[96 * 96]; // 9KB cropped image
 
 int counter = 0;
 
+// Latency probe: host writes "P<seq>", we echo "P<seq>,<millis>"
+void onProbeWritten(BLEDevice central, BLECharacteristic characteristic) {
+    String ping = inferenceChar.value();
+    if (!ping.startsWith("P")) return;
+    inferenceChar.writeValue(ping + "," + String(millis()));
+}
+
 void setup() {
     Serial.begin(115200);
     delay(1000);
@@ -34,6 +41,7 @@ void setup() {
         while (1);
     }
     BLE.setLocalName("Nano33BLE-Sensing");
+    inferenceChar.setEventHandler(BLEWritten, onProbeWritten);
     customService.addCharacteristic(inferenceChar);
     BLE.addService(customService);
     BLE.setAdvertisedService(customService);
@@ -1,11 +1,12 @@
 
+import time
 import asyncio
-import logging
 from bleak import BleakScanner, BleakClient
+from log_config import get_logger, get_message_logger
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+logger = get_logger("ble")
+# Every notification is logged here; sampled so bursts can't flood the queue
+msg_logger = get_message_logger("ble")
 
 # BLE UUIDs matching the Arduino sketch (main.cpp)
 SERVICE_UUID = "12345678-1234-5678-1234-56789abcdefa" 
@@ -17,13 +18,14 @@ class BLEService:
         self.device = None
         self.connected = False
         self.callbacks = []
+        self.interceptors = []
 
     async def scan_and_connect(self):
-        print("[BLE] Scanning for Arduino Nano 33 BLE Sense...")
+        logger.info("Scanning for Arduino Nano 33 BLE Sense...")
         try:
             devices = await BleakScanner.discover(timeout=5)
         except Exception as e:
-            print(f"[BLE] ✗ Scan error: {e}")
+            logger.error("✗ Scan error: %s", e)
             self._notify_all("SYSTEM: ARDUINO_SCAN_FAILED")
             return False
         
@@ -32,33 +34,31 @@ class BLEService:
             name = d.name or "Unknown"
             if "Nano33BLE" in name:
                 target_device = d
-                print(f"[BLE] Found: {name} ({d.address})")
+                logger.info("Found: %s (%s)", name, d.address)
                 break
         
         if not target_device:
-            print("[BLE] ✗ Arduino not found. Make sure it's powered on.")
+            logger.warning("✗ Arduino not found. Make sure it's powered on.")
             self._notify_all("SYSTEM: ARDUINO_SCAN_FAILED")
             return False
 
         self.device = target_device
         
         try:
-            import traceback
-            print(f"[BLE] Connecting to {target_device.name} ({target_device.address})...")
+            logger.info("Connecting to %s (%s)...", target_device.name, target_device.address)
             self.client = BleakClient(target_device.address, timeout=20.0)
             await self.client.connect()
             self.connected = True
-            print(f"[BLE] ✓ Connected!")
+            logger.info("✓ Connected!")
             self._notify_all("SYSTEM: ARDUINO_CONNECTED")
             
             # Subscribe to notifications
             await self.client.start_notify(CHARACTERISTIC_UUID_RX, self.notification_handler)
-            print(f"[BLE] ✓ Subscribed to notifications")
+            logger.info("✓ Subscribed to notifications")
             
             return True
         except Exception as e:
-            print(f"[BLE] ✗ Connection failed: {type(e).__name__}: {e}")
-            traceback.print_exc()
+            logger.exception("✗ Connection failed: %s: %s", type(e).__name__, e)
             self.connected = False
             self._notify_all("SYSTEM: ARDUINO_ERROR")
             return False
@@ -71,7 +71,7 @@ class BLEService:
                 pass
             await self.client.disconnect()
             self.connected = False
-            print("[BLE] Disconnected")
+            logger.info("Disconnected")
             self._notify_all("SYSTEM: ARDUINO_DISCONNECTED")
 
     def _notify_all(self, msg):
@@ -80,8 +80,14 @@ class BLEService:
 
     def notification_handler(self, sender, data):
         """Handle incoming data from Arduino"""
+        received_at = time.time()
         msg = data.decode('utf-8').strip()
-        print(f"[BLE] << {msg}")
+        msg_logger.info("<< %s", msg)
+
+        # Protocol replies (e.g. latency pongs) are consumed here, not forwarded
+        for interceptor in self.interceptors:
+            if interceptor(msg, received_at):
+                return
         
         # Forward to all registered callbacks (WebSocket → frontend)
         for callback in self.callbacks:
@@ -90,6 +96,10 @@ class BLEService:
     def register_callback(self, callback):
         self.callbacks.append(callback)
 
+    def register_interceptor(self, interceptor):
+        """Register a sync ``(msg, received_at) -> bool`` hook run before callbacks."""
+        self.interceptors.append(interceptor)
+
     async def send_command(self, command: str):
         if self.connected and self.client:
             await self.client.write_gatt_char(CHARACTERISTIC_UUID_RX, command.encode('utf-8'))
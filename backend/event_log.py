@@ -0,0 +1,79 @@
+import os
+import json
+import asyncio
+from log_config import get_logger
+
+logger = get_logger("events")
+
+FLUSH_SIZE = 256  # buffered events before a background write
+
+
+class EventLog:
+    """Append-only JSON Lines log of per-inference BLE messages.
+
+    Events are buffered in memory and appended from a worker thread, so the
+    notification path never waits on disk. ``record()`` is synchronous so it
+    can be called straight from the notification handler. One line per event:
+    ``{"runStart", "dataset", "receivedAt", "message"}`` with times in epoch
+    milliseconds, matching the run records in history.json.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.buffer = []
+        self._lock = asyncio.Lock()
+        self._tasks = set()  # background writes, referenced until they finish
+
+    def record(self, run_start, dataset, message, received_at):
+        """Buffer one event; ``received_at`` is the arrival time in epoch seconds."""
+        self.buffer.append({
+            "runStart": run_start,
+            "dataset": dataset,
+            "receivedAt": received_at * 1000,
+            "message": message,
+        })
+        if len(self.buffer) >= FLUSH_SIZE:
+            self._schedule_write()
+
+    async def flush(self):
+        """Write everything buffered and wait for all pending writes to finish."""
+        self._schedule_write()
+        if self._tasks:
+            await asyncio.gather(*self._tasks)
+
+    def _schedule_write(self):
+        # Batches are taken in order and tasks acquire the lock in creation order
+        if not self.buffer:
+            return
+        batch, self.buffer = self.buffer, []
+        task = asyncio.create_task(self._write(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _write(self, batch):
+        async with self._lock:
+            try:
+                await asyncio.to_thread(self._append, batch)
+            except OSError as e:
+                logger.error("Failed to write %d events: %s", len(batch), e)
+
+    def _append(self, batch):
+        with open(self.path, "a") as f:
+            f.writelines(json.dumps(event) + "\n" for event in batch)
+
+    def iter_chunks(self, chunk_size):
+        """Yield lists of at most ``chunk_size`` events, reading the file lazily."""
+        if not os.path.exists(self.path):
+            return
+        chunk = []
+        with open(self.path, "r") as f:
+            for line in f:
+                try:
+                    chunk.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
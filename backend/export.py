@@ -0,0 +1,225 @@
+"""
+Columnar export of run history and per-inference events.
+
+Streams Arrow IPC or Parquet when pyarrow is installed, CSV otherwise.
+Usage: python export.py {runs,events} [--format parquet] [--dataset person]
+                        [--since 2026-01-01] [--until ...] [-o out.parquet]
+"""
+import io
+import os
+import csv
+import math
+import sys
+import json
+import argparse
+from datetime import datetime
+from event_log import EventLog
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+HISTORY_FILE = os.path.join(DATA_DIR, "history.json")
+EVENTS_FILE = os.path.join(DATA_DIR, "events.jsonl")
+
+CHUNK_ROWS = 1024
+
+# (column, type) — times are epoch milliseconds, as sent by the frontend
+RUN_COLUMNS = [
+    ("timestamp", str),
+    ("dataset", str),
+    ("startTime", float),
+    ("endTime", float),
+    ("duration", float),
+    ("activeDuration", float),
+    ("totalRuns", int),
+    ("accuracy", float),
+    ("fps", float),
+    ("notes", str),
+]
+EVENT_COLUMNS = [
+    ("runStart", float),
+    ("dataset", str),
+    ("receivedAt", float),
+    ("message", str),
+]
+
+FORMATS = {
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "csv": ("text/csv", "csv"),
+}
+
+
+def resolve_format(fmt):
+    """Falls back to CSV when pyarrow is unavailable."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt}")
+    if fmt != "csv" and pa is None:
+        return "csv"
+    return fmt
+
+
+def parse_time(value):
+    """Accepts epoch milliseconds or an ISO date/datetime; returns epoch ms."""
+    if value is None or value == "":
+        return None
+    try:
+        ms = float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp() * 1000
+    if not math.isfinite(ms):
+        raise ValueError(f"Time must be finite: {value}")
+    return ms
+
+
+def _matches(row, time_key, dataset, since, until):
+    if dataset and row.get("dataset") != dataset:
+        return False
+    t = row.get(time_key)
+    if since is not None and (t is None or t < since):
+        return False
+    if until is not None and (t is None or t >= until):
+        return False
+    return True
+
+
+def _filtered_chunks(rows, time_key, dataset, since, until):
+    chunk = []
+    for row in rows:
+        if _matches(row, time_key, dataset, since, until):
+            chunk.append(row)
+            if len(chunk) >= CHUNK_ROWS:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_chunks(history_file=HISTORY_FILE, dataset=None, since=None, until=None):
+    """Run records, oldest first, filtered and grouped into chunks."""
+    if not os.path.exists(history_file):
+        return
+    try:
+        with open(history_file, 'r') as f:
+            history = json.load(f)
+    except json.JSONDecodeError:
+        return
+    yield from _filtered_chunks(reversed(history), "startTime", dataset, since, until)
+
+
+def event_chunks(events_file=EVENTS_FILE, dataset=None, since=None, until=None):
+    """Per-inference events, read lazily from the event log and filtered."""
+    rows = (event for chunk in EventLog(events_file).iter_chunks(CHUNK_ROWS) for event in chunk)
+    yield from _filtered_chunks(rows, "receivedAt", dataset, since, until)
+
+
+class _DrainSink(io.RawIOBase):
+    """Write-only sink whose contents are handed out after each batch."""
+
+    def __init__(self):
+        self._parts = []
+        self._pos = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        self._parts.append(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._pos
+
+    def drain(self):
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def _arrow_schema(columns):
+    types = {str: pa.string(), float: pa.float64(), int: pa.int64()}
+    return pa.schema([(name, types[kind]) for name, kind in columns])
+
+
+def _iter_arrow(chunks, columns, fmt):
+    schema = _arrow_schema(columns)
+    sink = _DrainSink()
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(sink, schema)
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+    try:
+        for chunk in chunks:
+            batch = pa.RecordBatch.from_pylist(chunk, schema=schema)
+            if fmt == "parquet":
+                writer.write_batch(batch, row_group_size=CHUNK_ROWS)
+            else:
+                writer.write_batch(batch)
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def _iter_csv(chunks, columns):
+    names = [name for name, _ in columns]
+    buf = io.StringIO()
+    out = csv.writer(buf)
+    out.writerow(names)
+    for chunk in chunks:
+        out.writerows([row.get(name) for name in names] for row in chunk)
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    yield buf.getvalue().encode("utf-8")
+
+
+def stream_export(kind, fmt, dataset=None, since=None, until=None,
+                  history_file=HISTORY_FILE, events_file=EVENTS_FILE):
+    """Yields the serialized export chunk by chunk; ``fmt`` must be resolved."""
+    if kind == "runs":
+        chunks, columns = run_chunks(history_file, dataset, since, until), RUN_COLUMNS
+    elif kind == "events":
+        chunks, columns = event_chunks(events_file, dataset, since, until), EVENT_COLUMNS
+    else:
+        raise ValueError(f"Unknown export kind: {kind}")
+
+    if fmt == "csv":
+        yield from _iter_csv(chunks, columns)
+    else:
+        yield from _iter_arrow(chunks, columns, fmt)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export run history or inference events.")
+    parser.add_argument("kind", choices=["runs", "events"])
+    parser.add_argument("--format", choices=list(FORMATS), default="parquet")
+    parser.add_argument("--dataset")
+    parser.add_argument("--since", type=parse_time, help="epoch ms or ISO date")
+    parser.add_argument("--until", type=parse_time, help="epoch ms or ISO date")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    args = parser.parse_args()
+
+    fmt = resolve_format(args.format)
+    if fmt != args.format:
+        print(f"pyarrow not installed, exporting {fmt} instead", file=sys.stderr)
+
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for data in stream_export(args.kind, fmt, args.dataset,
+                                  args.since, args.until):
+            out.write(data)
+    finally:
+        if args.output:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
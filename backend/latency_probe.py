@@ -0,0 +1,154 @@
+import re
+import time
+import asyncio
+import statistics
+from collections import deque
+from log_config import get_logger
+
+logger = get_logger("latency")
+
+# Ping "P<seq>" is echoed by the board as "P<seq>,<millis>" (fits the 20-byte characteristic)
+PONG_PATTERN = re.compile(r"^P(\d+),(\d+)$")
+SEQ_MODULO = 10000
+
+PROBE_INTERVAL = 2.0   # seconds between pings
+PING_TIMEOUT = 5.0     # unanswered pings older than this are dropped
+WINDOW_SIZE = 256      # samples kept for percentiles and the clock fit
+FILTER_SIZE = 8        # NTP clock filter: best of the last N samples
+JUMP_RTTS = 4          # offset step (in RTTs) treated as a new device clock epoch
+
+
+class LatencyProbe:
+    """Measures BLE round-trip time and the board's clock offset.
+
+    Each reply gives an NTP-style sample: with host send/receive times t0/t3
+    and device time td, ``rtt = t3 - t0`` and ``offset = td - (t0 + t3) / 2``.
+    The offset estimate comes from the lowest-RTT recent sample (least
+    queueing), and drift is a least-squares fit over the low-RTT samples.
+    A reconnect or a sudden offset step (board reboot, ``millis()`` restarting)
+    starts a new clock epoch and discards the old samples.
+    """
+
+    def __init__(self, ble, interval=PROBE_INTERVAL):
+        self.ble = ble
+        self.interval = interval
+        self.seq = 0
+        self.connected = False
+        self.reset()
+
+    def reset(self):
+        """Start over for a new connection: drop samples, pending pings and counters."""
+        self.pending = {}
+        self.sent = 0
+        self.lost = 0
+        self._new_epoch()
+
+    def _new_epoch(self):
+        self.samples = deque(maxlen=WINDOW_SIZE)  # (host_mid, rtt, offset)
+
+    async def run(self):
+        """Ping periodically while connected; meant to run as a background task."""
+        while True:
+            await asyncio.sleep(self.interval)
+            if not self.ble.connected:
+                self.connected = False
+                self.pending.clear()
+                continue
+            if not self.connected:
+                self.connected = True
+                self.reset()
+            try:
+                await self.ping()
+            except Exception as e:
+                logger.debug("Ping failed: %s", e)
+
+    async def ping(self):
+        self._expire()
+        self.seq = (self.seq + 1) % SEQ_MODULO
+        self.pending[self.seq] = time.time()
+        self.sent += 1
+        await self.ble.send_command(f"P{self.seq}")
+
+    def handle_message(self, msg, received_at):
+        """Interceptor for BLE notifications; returns True if ``msg`` was a pong."""
+        match = PONG_PATTERN.match(msg)
+        if not match:
+            return False
+
+        seq, device_ms = int(match.group(1)), int(match.group(2))
+        sent_at = self.pending.pop(seq, None)
+        if sent_at is None:
+            logger.debug("Unmatched pong #%d", seq)
+            return True
+
+        rtt = received_at - sent_at
+        host_mid = (sent_at + received_at) / 2
+        offset = device_ms / 1000.0 - host_mid
+
+        model = self._clock_model()
+        if model is not None:
+            expected = model[0] + model[1] * (host_mid - model[2])
+            best_rtt = min(s[1] for s in self.samples)
+            if abs(offset - expected) > JUMP_RTTS * max(rtt, best_rtt):
+                logger.info("Device clock jumped by %.1f ms, starting new epoch",
+                            (offset - expected) * 1000)
+                self._new_epoch()
+        self.samples.append((host_mid, rtt, offset))
+        return True
+
+    def _expire(self):
+        cutoff = time.time() - PING_TIMEOUT
+        for seq in [s for s, t in self.pending.items() if t < cutoff]:
+            del self.pending[seq]
+            self.lost += 1
+
+    def _clock_model(self):
+        """Returns (offset, drift, reference_time) or None without samples."""
+        if not self.samples:
+            return None
+
+        recent = list(self.samples)[-FILTER_SIZE:]
+        ref, _, offset = min(recent, key=lambda s: s[1])
+
+        drift = 0.0
+        if len(self.samples) >= FILTER_SIZE:
+            cutoff = statistics.quantiles([s[1] for s in self.samples], n=4)[0]
+            best = [s for s in self.samples if s[1] <= cutoff]
+            if len(best) >= 2 and best[0][0] != best[-1][0]:
+                drift = statistics.linear_regression(
+                    [s[0] - ref for s in best], [s[2] for s in best]
+                ).slope
+        return offset, drift, ref
+
+    def to_host_time(self, device_ms):
+        """Converts a device ``millis()`` timestamp to host epoch seconds."""
+        model = self._clock_model()
+        if model is None:
+            return None
+        offset, drift, ref = model
+        # device = host + offset + drift * (host - ref), solved for host
+        return (device_ms / 1000.0 - offset + drift * ref) / (1 + drift)
+
+    def stats(self):
+        rtts = [s[1] * 1000 for s in self.samples]
+        result = {
+            "samples": len(rtts),
+            "sent": self.sent,
+            "lost": self.lost,
+            "rtt_ms": None,
+            "offset_ms": None,
+            "drift_ppm": None,
+        }
+        if rtts:
+            percentiles = statistics.quantiles(rtts, n=100, method="inclusive") if len(rtts) > 1 else rtts * 99
+            result["rtt_ms"] = {
+                "min": round(min(rtts), 2),
+                "p50": round(percentiles[49], 2),
+                "p90": round(percentiles[89], 2),
+                "p99": round(percentiles[98], 2),
+                "max": round(max(rtts), 2),
+            }
+            offset, drift, _ = self._clock_model()
+            result["offset_ms"] = round(offset * 1000, 2)
+            result["drift_ppm"] = round(drift * 1e6, 2)
+        return result
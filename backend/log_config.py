@@ -0,0 +1,132 @@
+import os
+import time
+import queue
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener
+
+# Root logger for the backend; module loggers hang off it ("tinyml.ble", ...)
+ROOT_LOGGER = "tinyml"
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+# Per-message sampling defaults: let a burst through, then keep 1 in N
+DEFAULT_BURST = 20
+DEFAULT_SAMPLE_EVERY = 50
+
+_listener = None
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread.
+
+    The stock ``prepare()`` formats the record in the calling thread, which
+    is exactly the work we want off the event loop. Callers use lazy
+    ``%s`` arguments, so handing the record over untouched is safe.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """Rate-limits high-frequency records.
+
+    Within each one-second window the first ``burst`` records pass, after
+    that only every ``sample_every``-th one does. A passing record notes how
+    many were dropped since the last one got through.
+    """
+
+    def __init__(self, burst=DEFAULT_BURST, sample_every=DEFAULT_SAMPLE_EVERY):
+        super().__init__()
+        self.burst = burst
+        self.sample_every = sample_every
+        self._window = 0
+        self._seen = 0
+        self._suppressed = 0
+
+    def filter(self, record):
+        window = int(time.monotonic())
+        if window != self._window:
+            self._window = window
+            self._seen = 0
+        self._seen += 1
+
+        if self._seen <= self.burst or (
+            self.sample_every > 0 and (self._seen - self.burst) % self.sample_every == 0
+        ):
+            if self._suppressed:
+                record.msg = f"{record.msg} (+{self._suppressed} suppressed)"
+                self._suppressed = 0
+            return True
+
+        self._suppressed += 1
+        return False
+
+    def config(self):
+        return {"burst": self.burst, "sample_every": self.sample_every}
+
+
+# Shared filter instance so the admin endpoint can retune it at runtime
+message_sampler = SamplingFilter()
+
+
+def get_logger(name):
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def get_message_logger(name):
+    """Logger for per-message traffic, sampled by ``message_sampler``."""
+    logger = get_logger(f"{name}.messages")
+    if message_sampler not in logger.filters:
+        logger.addFilter(message_sampler)
+    return logger
+
+
+def setup_logging(level=None):
+    """Route all backend logging through a queue drained on a background thread."""
+    global _listener
+    if _listener is not None:
+        return
+
+    level = (level or os.environ.get("LOG_LEVEL", "INFO")).upper()
+
+    log_queue = queue.SimpleQueue()
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(level)
+    root.addHandler(_DeferredQueueHandler(log_queue))
+    root.propagate = False
+
+    _listener = QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Flush pending records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def get_levels():
+    """Effective level of the backend root logger and every configured child."""
+    prefix = ROOT_LOGGER + "."
+    names = [ROOT_LOGGER] + sorted(
+        name for name, obj in logging.root.manager.loggerDict.items()
+        if name.startswith(prefix) and isinstance(obj, logging.Logger)
+    )
+    return {name: logging.getLevelName(logging.getLogger(name).getEffectiveLevel()) for name in names}
+
+
+def set_level(level, name=None):
+    """Change a logger's level at runtime; ``name`` is relative to the backend root."""
+    level = level.upper()
+    if not isinstance(logging.getLevelName(level), int):
+        raise ValueError(f"Unknown log level: {level}")
+    target = logging.getLogger(ROOT_LOGGER if not name else f"{ROOT_LOGGER}.{name}")
+    target.setLevel(level)
+    return target.name
@@ -4,20 +4,28 @@ import json
 import time
 import glob
 import asyncio
-from typing import List, Optional
+from typing import List, Literal, Optional
 from datetime import datetime
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Query
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
+from log_config import setup_logging, get_logger, get_levels, set_level, message_sampler
 from ble_service import ble_manager
+from latency_probe import LatencyProbe
+from event_log import EventLog
+import export
+
+setup_logging()
+logger = get_logger("main")
 
 # Paths
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(BASE_DIR, "data")
 IMAGES_DIR = os.path.join(DATA_DIR, "images")
 HISTORY_FILE = os.path.join(DATA_DIR, "history.json")
+EVENTS_FILE = os.path.join(DATA_DIR, "events.jsonl")
 
 os.makedirs(IMAGES_DIR, exist_ok=True)
 
@@ -37,6 +45,12 @@ class RunResult(BaseModel):
     fps: float
     notes: Optional[str] = None
 
+class LogConfig(BaseModel):
+    level: Optional[str] = None
+    logger: Optional[str] = None  # relative to the backend root, e.g. "ble.messages"
+    burst: Optional[int] = None
+    sample_every: Optional[int] = None
+
 # Global State
 current_run: Optional[RunConfig] = None
 
@@ -66,6 +80,21 @@ async def forward_ble_to_ws(message):
 
 ble_manager.register_callback(forward_ble_to_ws)
 
+latency_probe = LatencyProbe(ble_manager)
+ble_manager.register_interceptor(latency_probe.handle_message)
+
+# Persist per-inference messages while a run is active. Runs as an interceptor
+# (after the probe, so pongs are skipped) to capture the arrival time and run
+# context before any callback task is scheduled.
+event_log = EventLog(EVENTS_FILE)
+
+def record_ble_event(message, received_at):
+    if current_run:
+        event_log.record(current_run.startTime, current_run.dataset, message, received_at)
+    return False
+
+ble_manager.register_interceptor(record_ble_event)
+
 # --- BLE Background Connection Loop ---
 
 async def ble_connect_loop():
@@ -74,14 +103,14 @@ async def ble_connect_loop():
         try:
             success = await ble_manager.scan_and_connect()
             if success:
-                print("[BLE] ✓ Ready! Listening for inference results...\n")
+                logger.info("✓ Ready! Listening for inference results...")
                 return
             else:
-                print("[BLE]   Retrying in 5 seconds...\n")
+                logger.info("  Retrying in 5 seconds...")
                 await asyncio.sleep(5)
         except Exception as e:
-            print(f"[BLE] ✗ Error: {e}")
-            print("[BLE]   Retrying in 5 seconds...\n")
+            logger.error("✗ Error: %s", e)
+            logger.info("  Retrying in 5 seconds...")
             await asyncio.sleep(5)
 
 # --- Lifespan (replaces deprecated on_event) ---
@@ -92,9 +121,12 @@ async def lifespan(app):
     print("  TinyML Extinction Testing Backend")
     print("="*60 + "\n")
     task = asyncio.create_task(ble_connect_loop())
+    probe_task = asyncio.create_task(latency_probe.run())
     yield
     task.cancel()
+    probe_task.cancel()
     await ble_manager.disconnect()
+    await event_log.flush()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -118,6 +150,29 @@ async def connect_ble():
     success = await ble_manager.scan_and_connect()
     return {"success": success, "connected": ble_manager.connected}
 
+@app.get("/api/latency")
+async def get_latency():
+    return latency_probe.stats()
+
+# --- Admin Endpoints ---
+
+@app.get("/api/admin/logging")
+async def get_logging_config():
+    return {"levels": get_levels(), "sampling": message_sampler.config()}
+
+@app.put("/api/admin/logging")
+async def update_logging_config(config: LogConfig):
+    if config.level is not None:
+        try:
+            set_level(config.level, config.logger)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    if config.burst is not None:
+        message_sampler.burst = max(0, config.burst)
+    if config.sample_every is not None:
+        message_sampler.sample_every = max(0, config.sample_every)
+    return {"levels": get_levels(), "sampling": message_sampler.config()}
+
 # --- Image Endpoints ---
 
 @app.get("/api/images")
@@ -159,6 +214,7 @@ async def get_labels():
 async def stop_run(result: RunResult):
     global current_run
     current_run = None
+    await event_log.flush()
     
     history = []
     if os.path.exists(HISTORY_FILE):
@@ -177,6 +233,33 @@ async def stop_run(result: RunResult):
         
     return {"message": "Run saved", "record": record}
 
+@app.get("/api/export/{kind}")
+async def export_data(
+    kind: str,
+    format: Literal["arrow", "parquet", "csv"] = "parquet",
+    dataset: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+):
+    if kind not in ("runs", "events"):
+        raise HTTPException(status_code=404, detail="Unknown export kind")
+    try:
+        since_ms, until_ms = export.parse_time(since), export.parse_time(until)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if kind == "events":
+        await event_log.flush()
+
+    fmt = export.resolve_format(format)
+    media_type, extension = export.FORMATS[fmt]
+    return StreamingResponse(
+        export.stream_export(kind, fmt, dataset, since_ms, until_ms,
+                             history_file=HISTORY_FILE, events_file=EVENTS_FILE),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{kind}.{extension}"'},
+    )
+
 @app.get("/api/history")
 async def get_history():
     if os.path.exists(HISTORY_FILE):